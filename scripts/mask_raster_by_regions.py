@@ -0,0 +1,284 @@
+import argparse
+import os
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+try:
+    from osgeo import gdal
+except ImportError:  # fall back to spawning gdalwarp when bindings are absent
+    gdal = None
+
+# Prefer in-process gdal.Warp when the Python bindings are available: driver
+# registration and the PROJ database are initialized once and the block cache
+# survives across regions, instead of paying process startup per invocation.
+USE_GDAL_PYTHON = gdal is not None
+
+# gdalwarp invocation defaults; override via CLI flags where exposed.
+GDALWARP = "gdalwarp"
+GDALBUILDVRT = "gdalbuildvrt"
+DST_NODATA = -9999
+ADD_ALPHA = False
+OVERWRITE = False
+
+# Number of concurrent gdalwarp invocations. gdalwarp runs as an external
+# process, so threads are enough to keep several of them in flight.
+MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+# GDAL block cache and warp memory per gdalwarp process, in MB. Kept as
+# strings so percentage syntax ("10%") also works; lower these when running
+# many workers so the aggregate stays within RAM.
+GDAL_CACHEMAX_MB = "2048"
+WARP_MEMORY_MB = "2048"
+
+DEFAULT_CREATION_OPTS = [
+    "COMPRESS=DEFLATE",
+    "TILED=YES",
+    "BIGTIFF=IF_SAFER",
+    "NUM_THREADS=ALL_CPUS",
+]
+
+
+def build_creation_options(extra: Optional[List[str]] = None) -> List[str]:
+    """Return creation options pre-expanded as a flat ["-co", opt, ...] list."""
+    opts = list(DEFAULT_CREATION_OPTS)
+    if extra:
+        opts.extend(extra)
+    flat: List[str] = []
+    for opt in opts:
+        flat.extend(("-co", opt))
+    return flat
+
+
+def iter_shapefiles(folder: Path) -> List[Path]:
+    """Return the region shapefiles in `folder`, sorted for stable output order."""
+    # os.scandir reads the file type from the directory entry itself, unlike
+    # glob + is_file() which stats every candidate a second time.
+    with os.scandir(folder) as it:
+        return sorted(
+            Path(entry.path)
+            for entry in it
+            if entry.is_file() and entry.name.lower().endswith(".shp")
+        )
+
+
+def _warp_memory_limit_mb() -> Optional[int]:
+    """Warp memory for gdal.Warp; percentage syntax only applies to the CLI path."""
+    try:
+        return int(WARP_MEMORY_MB)
+    except ValueError:
+        return None
+
+
+def _configure_gdal_cache() -> None:
+    if gdal is None:
+        return
+    # Config option rather than SetCacheMax: the byte count for 2048 MB is
+    # 2**31, which overflows builds where SetCacheMax binds a 32-bit int,
+    # and the option keeps the percentage syntax working too.
+    gdal.SetConfigOption("GDAL_CACHEMAX", GDAL_CACHEMAX_MB)
+
+
+def _build_source_vrt(input_raster: Path, output_dir: Path) -> Path:
+    """
+    Build a lightweight VRT over the source raster once so every region warp
+    opens the same small metadata file instead of re-parsing the raster
+    directory per region. Falls back to the raster itself on failure.
+    """
+    vrt_path = output_dir / f"{input_raster.stem}_source.vrt"
+    if gdal is not None:
+        vrt_ds = gdal.BuildVRT(str(vrt_path), str(input_raster))
+        if vrt_ds is None:
+            return input_raster
+        vrt_ds = None  # close to flush
+        return vrt_path
+    rc = subprocess.run(
+        [GDALBUILDVRT, "-overwrite", str(vrt_path), str(input_raster)]
+    ).returncode
+    if rc != 0:
+        return input_raster
+    return vrt_path
+
+
+def run_mask(
+    gdalwarp_cmd: str,
+    input_raster: Path,
+    region: Path,
+    output: Path,
+    dst_nodata: int,
+    add_alpha: bool,
+    creation_options: List[str],
+    overwrite: bool,
+) -> int:
+    """
+    Clip `input_raster` to the cutline in `region`.
+    Uses in-process gdal.Warp when the bindings are available, otherwise a
+    gdalwarp subprocess. Returns 0 on success, non-zero on failure.
+    """
+    if USE_GDAL_PYTHON:
+        return _run_mask_gdal(
+            input_raster, region, output, dst_nodata, add_alpha, creation_options, overwrite
+        )
+    return _run_mask_subprocess(
+        gdalwarp_cmd,
+        input_raster,
+        region,
+        output,
+        dst_nodata,
+        add_alpha,
+        creation_options,
+        overwrite,
+    )
+
+
+def _run_mask_gdal(
+    input_raster: Path,
+    region: Path,
+    output: Path,
+    dst_nodata: int,
+    add_alpha: bool,
+    creation_options: List[str],
+    overwrite: bool,
+) -> int:
+    # gdal.Warp without -overwrite mosaics into an existing destination,
+    # keeping its stale grid/extent; remove it first so reruns recreate it.
+    if overwrite:
+        try:
+            output.unlink()
+        except OSError:
+            pass
+    warp_kwargs = dict(
+        cutlineDSName=str(region),
+        cropToCutline=True,
+        dstNodata=dst_nodata,
+        dstAlpha=add_alpha,
+        multithread=True,
+        # the flat list interleaves "-co" flags; the bindings want bare options
+        creationOptions=creation_options[1::2],
+        warpOptions=["NUM_THREADS=ALL_CPUS"],
+    )
+    warp_mem = _warp_memory_limit_mb()
+    if warp_mem is not None:
+        warp_kwargs["warpMemoryLimit"] = warp_mem
+    ds = gdal.Warp(str(output), str(input_raster), **warp_kwargs)
+    if ds is None:
+        return 1
+    ds = None  # close to flush
+    return 0
+
+
+def _run_mask_subprocess(
+    gdalwarp_cmd: str,
+    input_raster: Path,
+    region: Path,
+    output: Path,
+    dst_nodata: int,
+    add_alpha: bool,
+    creation_options: List[str],
+    overwrite: bool,
+) -> int:
+    # Build the command as one literal with os.fspath (C-level, no Path
+    # round-trips) instead of successive str()/extend calls.
+    cmd = [
+        gdalwarp_cmd,
+        "--config", "GDAL_CACHEMAX", GDAL_CACHEMAX_MB,
+        "-wm", WARP_MEMORY_MB,
+        "-multi", "-wo", "NUM_THREADS=ALL_CPUS",
+        *(("-overwrite",) if overwrite else ()),
+        "-cutline", os.fspath(region),
+        "-crop_to_cutline",
+        "-dstnodata", str(dst_nodata),
+        *(("-dstalpha",) if add_alpha else ()),
+    ]
+    cmd.extend(creation_options)  # already flat ["-co", opt, ...]
+    cmd.extend([os.fspath(input_raster), os.fspath(output)])
+    proc = subprocess.run(cmd)
+    return proc.returncode
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Mask a raster with every region shapefile in a folder using gdalwarp."
+    )
+    parser.add_argument("--input-raster", required=True, help="Source raster to mask.")
+    parser.add_argument(
+        "--regions-dir", required=True, help="Folder containing one .shp per region."
+    )
+    parser.add_argument("--output-dir", required=True, help="Folder for the masked rasters.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=MAX_WORKERS,
+        help=f"Concurrent gdalwarp processes (default: {MAX_WORKERS}).",
+    )
+    parser.add_argument(
+        "--overwrite", action="store_true", default=OVERWRITE, help="Overwrite existing outputs."
+    )
+    args = parser.parse_args()
+
+    input_raster = Path(args.input_raster).expanduser()
+    regions_dir = Path(args.regions_dir).expanduser()
+    output_dir = Path(args.output_dir).expanduser()
+
+    if not input_raster.is_file():
+        raise SystemExit(f"Input raster not found: {input_raster}")
+    if not regions_dir.is_dir():
+        raise SystemExit(f"Regions directory not found: {regions_dir}")
+
+    shapefiles = iter_shapefiles(regions_dir)
+    if not shapefiles:
+        raise SystemExit(f"No shapefiles found in {regions_dir}")
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    creation_options = build_creation_options()
+    _configure_gdal_cache()
+
+    jobs: List[Tuple[Path, Path]] = []
+    for shp in shapefiles:
+        out_path = output_dir / f"{input_raster.stem}_{shp.stem}.tif"
+        if out_path.exists() and not args.overwrite:
+            print(f"Skipping {shp.stem}: {out_path} already exists")
+            continue
+        jobs.append((shp, out_path))
+
+    warp_source = _build_source_vrt(input_raster, output_dir)
+    failures: List[Tuple[Path, int]] = []
+    try:
+        with ThreadPoolExecutor(max_workers=args.workers) as ex:
+            futures = {
+                ex.submit(
+                    run_mask,
+                    GDALWARP,
+                    warp_source,
+                    shp,
+                    out,
+                    DST_NODATA,
+                    ADD_ALPHA,
+                    creation_options,
+                    args.overwrite,
+                ): (shp, out)
+                for shp, out in jobs
+            }
+            for fut in as_completed(futures):
+                shp, out = futures[fut]
+                rc = fut.result()
+                if rc != 0:
+                    failures.append((shp, rc))
+                    print(f"gdalwarp failed for {shp.name} (rc={rc})")
+                else:
+                    print(f"Masked {shp.stem} -> {out}")
+    finally:
+        if warp_source != input_raster:
+            try:
+                warp_source.unlink()
+            except OSError:
+                pass
+
+    if failures:
+        raise SystemExit(f"{len(failures)} region(s) failed; see messages above.")
+    print(f"Masked {len(jobs)} region(s) into {output_dir}")
+
+
+if __name__ == "__main__":
+    main()
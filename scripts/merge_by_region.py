@@ -0,0 +1,362 @@
+import argparse
+import os
+import re
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from osgeo import gdal
+except ImportError:  # fall back to spawning gdalwarp when bindings are absent
+    gdal = None
+
+# Prefer in-process gdal.Warp when the Python bindings are available: driver
+# registration and the PROJ database are initialized once and the block cache
+# survives across regions, instead of paying process startup per invocation.
+USE_GDAL_PYTHON = gdal is not None
+
+# gdalwarp invocation defaults; override via CLI flags where exposed.
+GDALWARP = "gdalwarp"
+GDALBUILDVRT = "gdalbuildvrt"
+DST_NODATA = -9999
+OVERWRITE = False
+
+# Above this many tiles, mosaic through a temporary VRT so gdalwarp sees a
+# single virtual dataset instead of opening every tile up front.
+VRT_THRESHOLD = 50
+
+# Characters that may separate the region token from the rest of a tile stem,
+# e.g. "andalucia_2023_tile4.tif" or "andalucia-2023-tile4.tif".
+DEFAULT_SEPARATORS = "_-"
+
+# Number of concurrent gdalwarp invocations (one per region being merged).
+MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+# GDAL block cache and warp memory per gdalwarp process, in MB. Kept as
+# strings so percentage syntax ("10%") also works; lower these when running
+# many workers so the aggregate stays within RAM.
+GDAL_CACHEMAX_MB = "2048"
+WARP_MEMORY_MB = "2048"
+
+DEFAULT_CREATION_OPTS = [
+    "COMPRESS=DEFLATE",
+    "TILED=YES",
+    "BIGTIFF=IF_SAFER",
+    "NUM_THREADS=ALL_CPUS",
+]
+
+# Compiled separator patterns, keyed by the separator string, so the hot
+# find_tiles loop does not recompile the same regex for every tile.
+_sep_cache: Dict[str, "re.Pattern[str]"] = {}
+
+
+def build_creation_options(extra: Optional[List[str]] = None) -> List[str]:
+    """Return creation options pre-expanded as a flat ["-co", opt, ...] list."""
+    opts = list(DEFAULT_CREATION_OPTS)
+    if extra:
+        opts.extend(extra)
+    flat: List[str] = []
+    for opt in opts:
+        flat.extend(("-co", opt))
+    return flat
+
+
+def extract_region(
+    stem: str, prefix: str = "", separators: str = DEFAULT_SEPARATORS
+) -> Optional[str]:
+    """
+    Extract the leading region token from a tile filename stem.
+    Returns None when the stem does not match the expected prefix or is empty.
+    """
+    if prefix:
+        if not stem.startswith(prefix):
+            return None
+        trimmed = stem[len(prefix):]
+    else:
+        trimmed = stem
+    # Pure-string fast path: for small separator sets a few str.find calls
+    # (tight C loops) beat entering the regex engine for every stem.
+    if len(separators) <= 4:
+        cut = -1
+        for sep in separators:
+            idx = trimmed.find(sep)
+            if idx != -1 and (cut == -1 or idx < cut):
+                cut = idx
+        region = trimmed if cut == -1 else trimmed[:cut]
+        return region or None
+    pat = _sep_cache.get(separators)
+    if pat is None:
+        pat = re.compile(f"[{re.escape(separators)}]")
+        _sep_cache[separators] = pat
+    parts = pat.split(trimmed, maxsplit=1)
+    region = parts[0]
+    return region or None
+
+
+def find_tiles(
+    input_dir: Path,
+    output_dir: Path,
+    prefix: str = "",
+    separators: str = DEFAULT_SEPARATORS,
+) -> Dict[str, List[str]]:
+    """
+    Group every GeoTIFF under `input_dir` by region token, skipping anything
+    already inside `output_dir`. Paths are returned as strings; they feed
+    straight into command lines, so Path wrappers would only be converted
+    back again.
+    """
+    tiles: Dict[str, List[str]] = {}
+    # Normalize both sides before comparing: with relative CLI paths like
+    # "--input-dir . --output-dir out" a raw string prefix test misses and
+    # previous mosaics get re-ingested as input tiles.
+    out_str = os.path.abspath(output_dir)
+    out_prefix = out_str + os.sep
+    # Walk with os.scandir instead of rglob: DirEntry caches the file type
+    # from the directory read, so no extra stat per entry, and rejected files
+    # never get wrapped in a Path.
+    stack = [os.path.abspath(input_dir)]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.path != out_str:  # skip previous outputs
+                        stack.append(entry.path)
+                elif entry.is_file():
+                    if not entry.name.lower().endswith((".tif", ".tiff")):
+                        continue
+                    if entry.path.startswith(out_prefix):
+                        continue
+                    region = extract_region(
+                        os.path.splitext(entry.name)[0], prefix, separators
+                    )
+                    if region is None:
+                        continue
+                    tiles.setdefault(region, []).append(entry.path)
+    return {region: sorted(paths) for region, paths in tiles.items()}
+
+
+def _build_vrt(inputs: List[str], vrt_path: Path) -> int:
+    """
+    Write a VRT referencing `inputs`, passing the tile list through a file
+    to avoid command-line length limits.
+    """
+    with tempfile.NamedTemporaryFile(
+        "w", suffix=".txt", delete=False, dir=vrt_path.parent
+    ) as list_file:
+        list_file.write("\n".join(inputs))
+        list_path = list_file.name
+    try:
+        proc = subprocess.run(
+            [GDALBUILDVRT, "-overwrite", "-input_file_list", list_path, str(vrt_path)]
+        )
+        return proc.returncode
+    finally:
+        try:
+            os.unlink(list_path)
+        except OSError:
+            pass
+
+
+def _warp_memory_limit_mb() -> Optional[int]:
+    """Warp memory for gdal.Warp; percentage syntax only applies to the CLI path."""
+    try:
+        return int(WARP_MEMORY_MB)
+    except ValueError:
+        return None
+
+
+def _configure_gdal_cache() -> None:
+    if gdal is None:
+        return
+    # Config option rather than SetCacheMax: the byte count for 2048 MB is
+    # 2**31, which overflows builds where SetCacheMax binds a 32-bit int,
+    # and the option keeps the percentage syntax working too.
+    gdal.SetConfigOption("GDAL_CACHEMAX", GDAL_CACHEMAX_MB)
+
+
+def run_merge(
+    gdalwarp_cmd: str,
+    inputs: List[str],
+    output: Path,
+    dst_nodata: int,
+    creation_options: List[str],
+    overwrite: bool,
+) -> int:
+    """
+    Mosaic `inputs` into `output`.
+    Uses in-process gdal.Warp when the bindings are available, otherwise a
+    gdalwarp subprocess. Large tile sets are first collected into a VRT
+    (metadata only) so the warp streams blocks from one virtual dataset
+    rather than opening every tile at once. Returns 0 on success.
+    """
+    if USE_GDAL_PYTHON:
+        return _run_merge_gdal(inputs, output, dst_nodata, creation_options, overwrite)
+    return _run_merge_subprocess(
+        gdalwarp_cmd, inputs, output, dst_nodata, creation_options, overwrite
+    )
+
+
+def _run_merge_gdal(
+    inputs: List[str],
+    output: Path,
+    dst_nodata: int,
+    creation_options: List[str],
+    overwrite: bool,
+) -> int:
+    # gdal.Warp without -overwrite mosaics into an existing destination,
+    # keeping its stale grid/extent; remove it first so reruns recreate it.
+    if overwrite:
+        try:
+            output.unlink()
+        except OSError:
+            pass
+    if len(inputs) > VRT_THRESHOLD:
+        src = gdal.BuildVRT("", inputs)
+        if src is None:
+            return 1
+    else:
+        src = inputs
+    warp_kwargs = dict(
+        dstNodata=dst_nodata,
+        multithread=True,
+        # the flat list interleaves "-co" flags; the bindings want bare options
+        creationOptions=creation_options[1::2],
+        warpOptions=["NUM_THREADS=ALL_CPUS"],
+    )
+    warp_mem = _warp_memory_limit_mb()
+    if warp_mem is not None:
+        warp_kwargs["warpMemoryLimit"] = warp_mem
+    ds = gdal.Warp(str(output), src, **warp_kwargs)
+    if ds is None:
+        return 1
+    ds = None  # close to flush
+    return 0
+
+
+def _run_merge_subprocess(
+    gdalwarp_cmd: str,
+    inputs: List[str],
+    output: Path,
+    dst_nodata: int,
+    creation_options: List[str],
+    overwrite: bool,
+) -> int:
+    vrt_path: Optional[Path] = None
+    try:
+        if len(inputs) > VRT_THRESHOLD:
+            vrt_path = output.with_suffix(".vrt")
+            rc = _build_vrt(inputs, vrt_path)
+            if rc != 0:
+                return rc
+            warp_inputs = [os.fspath(vrt_path)]
+        else:
+            warp_inputs = inputs
+
+        # Build the command as one literal; inputs are already strings, so no
+        # per-tile str()/Path round-trips remain on the 10k-tile path.
+        cmd = [
+            gdalwarp_cmd,
+            "--config", "GDAL_CACHEMAX", GDAL_CACHEMAX_MB,
+            "-wm", WARP_MEMORY_MB,
+            "-multi", "-wo", "NUM_THREADS=ALL_CPUS",
+            *(("-overwrite",) if overwrite else ()),
+            "-dstnodata", str(dst_nodata),
+        ]
+        cmd.extend(creation_options)  # already flat ["-co", opt, ...]
+        cmd.extend(warp_inputs)
+        cmd.append(os.fspath(output))
+        proc = subprocess.run(cmd)
+        return proc.returncode
+    finally:
+        if vrt_path is not None:
+            try:
+                vrt_path.unlink()
+            except OSError:
+                pass
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Merge per-region raster tiles into one mosaic per region using gdalwarp."
+    )
+    parser.add_argument(
+        "--input-dir", required=True, help="Folder (searched recursively) containing the tiles."
+    )
+    parser.add_argument("--output-dir", required=True, help="Folder for the merged mosaics.")
+    parser.add_argument(
+        "--prefix", default="", help="Optional stem prefix to strip before the region token."
+    )
+    parser.add_argument(
+        "--separators",
+        default=DEFAULT_SEPARATORS,
+        help=f"Characters separating the region token (default: {DEFAULT_SEPARATORS!r}).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=MAX_WORKERS,
+        help=f"Concurrent gdalwarp processes (default: {MAX_WORKERS}).",
+    )
+    parser.add_argument(
+        "--overwrite", action="store_true", default=OVERWRITE, help="Overwrite existing outputs."
+    )
+    args = parser.parse_args()
+
+    input_dir = Path(args.input_dir).expanduser()
+    output_dir = Path(args.output_dir).expanduser()
+
+    if not input_dir.is_dir():
+        raise SystemExit(f"Input directory not found: {input_dir}")
+
+    tiles_by_region = find_tiles(input_dir, output_dir, args.prefix, args.separators)
+    if not tiles_by_region:
+        raise SystemExit(f"No region tiles found under {input_dir}")
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    creation_options = build_creation_options()
+    _configure_gdal_cache()
+
+    jobs: List[Tuple[str, List[str], Path]] = []
+    for region, paths in sorted(tiles_by_region.items()):
+        out_path = output_dir / f"{region}_merged.tif"
+        if out_path.exists() and not args.overwrite:
+            print(f"Skipping {region}: {out_path} already exists")
+            continue
+        jobs.append((region, paths, out_path))
+
+    failures: List[Tuple[str, int]] = []
+    with ThreadPoolExecutor(max_workers=args.workers) as ex:
+        futures = {
+            ex.submit(
+                run_merge,
+                GDALWARP,
+                paths,
+                out,
+                DST_NODATA,
+                creation_options,
+                args.overwrite,
+            ): (region, out)
+            for region, paths, out in jobs
+        }
+        for fut in as_completed(futures):
+            region, out = futures[fut]
+            rc = fut.result()
+            if rc != 0:
+                failures.append((region, rc))
+                print(f"gdalwarp failed for {region} (rc={rc})")
+            else:
+                print(f"Merged {region} -> {out}")
+
+    if failures:
+        raise SystemExit(f"{len(failures)} region(s) failed; see messages above.")
+    print(f"Merged {len(jobs)} region(s) into {output_dir}")
+
+
+if __name__ == "__main__":
+    main()
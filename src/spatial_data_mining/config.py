@@ -4,6 +4,12 @@ from pathlib import Path
 from typing import Any, Dict, List, Tuple
 
 import yaml
+
+try:  # libyaml bindings are optional; the C loader is much faster when present
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 from pydantic import BaseModel, Field, field_validator, model_validator
 
 
@@ -35,6 +41,7 @@ class JobConfig(BaseModel):
     seasons: List[str] | None = None
     variables: List[str]
     storage: StorageConfig
+    max_workers: int | None = None
 
     @field_validator("variables")
     @classmethod
@@ -52,6 +59,15 @@ class JobConfig(BaseModel):
             raise ValueError("resolution_m must be positive when provided")
         return value
 
+    @field_validator("max_workers")
+    @classmethod
+    def max_workers_positive_or_none(cls, value: int | None):
+        if value is None:
+            return None
+        if value < 1:
+            raise ValueError("max_workers must be at least 1 when provided")
+        return value
+
     @model_validator(mode="after")
     def normalize_aois(cls, model: "JobConfig") -> "JobConfig":
         paths: List[str] = []
@@ -135,7 +151,7 @@ class JobConfig(BaseModel):
 
 def _load_yaml(path: Path) -> Dict[str, Any]:
     with path.open("r", encoding="utf-8") as f:
-        return yaml.safe_load(f) or {}
+        return yaml.load(f, Loader=_YamlLoader) or {}
 
 
 def _merge_job(
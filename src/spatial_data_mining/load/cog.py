@@ -5,17 +5,32 @@ from rasterio.enums import Resampling
 from rasterio.shutil import copy as rio_copy
 
 
-def write_cog(src_path: Path, dst_path: Path) -> None:
+def write_cog(
+    src_path: Path,
+    dst_path: Path,
+    overview_resampling: str = "nearest",
+    blocksize: int = 512,
+    num_threads: str | int = "ALL_CPUS",
+) -> None:
+    """
+    Copy `src_path` to a Cloud-Optimized GeoTIFF at `dst_path`.
+
+    The COG driver emits tiles and overviews in a single streaming pass, so
+    the overview resampling, block size, and compression threading are
+    exposed here rather than rebuilt in a second pass. The default nearest
+    resampling stays safe for categorical rasters (e.g. CLCplus).
+    """
     dst_path = Path(dst_path)
     dst_path.parent.mkdir(parents=True, exist_ok=True)
 
     cog_profile = dict(
         driver="COG",
         compress="deflate",
-        blocksize=512,
+        blocksize=blocksize,
         # use string to avoid GDAL enum issues in some builds
-        overview_resampling="nearest",
+        overview_resampling=overview_resampling,
         bigtiff="IF_SAFER",
+        num_threads=str(num_threads),
     )
     with rasterio.Env():
         rio_copy(str(src_path), str(dst_path), **cog_profile)
@@ -1,9 +1,13 @@
+import functools
 import logging
+import os
 import re
+import shutil
 import tempfile
 import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Dict, Any, Callable, Optional
+from typing import List, Dict, Any, Callable, Optional, Tuple
 
 from spatial_data_mining.config import (
     load_job_config,
@@ -27,12 +31,179 @@ def _notify(cb: ProgressCB, message: str) -> None:
             logging.getLogger(__name__).warning("Progress callback failed: %s", exc)
 
 
+@functools.lru_cache(maxsize=128)
+def _load_aoi_cached(aoi_path_str: str, target_crs: str, mtime: float) -> Tuple[dict, Any]:
+    """
+    Load and reproject an AOI, cached per (path, target CRS, mtime) so
+    repeated runs over the same file (common in UI sessions) skip the
+    read/reproject entirely. The mtime key invalidates stale entries.
+    """
+    aoi_gdf = load_aoi(aoi_path_str)
+    return get_aoi_geometries(aoi_gdf, target_crs)
+
+
+_SLUG_RE = re.compile(r"[^A-Za-z0-9]+")
+
+
 def _slugify_name(name: str) -> str:
     """Lowercase slug for filenames; collapse non-alnum to underscores."""
-    slug = re.sub(r"[^A-Za-z0-9]+", "_", str(name)).strip("_").lower()
+    slug = _SLUG_RE.sub("_", str(name)).strip("_").lower()
     return slug or "aoi"
 
 
+# Default number of concurrent (aoi, season, year, variable) tasks. Each task
+# is mostly network-bound (GEE download, GCS upload), so a small pool overlaps
+# latency without oversubscribing CPU during transforms.
+DEFAULT_MAX_WORKERS = 4
+
+# Concurrent GCS uploads; uploads run in the background so the task pool can
+# move on to the next extraction while bytes are in flight.
+UPLOAD_WORKERS = 4
+
+# (aoi_path, aoi_slug, geom_wgs84, geom_target, season, year, var_name)
+Task = Tuple[Any, str, dict, Any, str, int, str]
+
+
+def _process_one(
+    job_cfg,
+    output_dir: Path,
+    job_tmp: Path,
+    aoi_path,
+    aoi_slug: str,
+    geom_wgs84: dict,
+    geom_target: Any,
+    season: str,
+    season_slug: str,
+    year: int,
+    var_name: str,
+    var_slug: str,
+    var_def: Dict[str, Any],
+    upload_pool: Optional[ThreadPoolExecutor],
+    progress_cb: ProgressCB,
+    should_stop: Optional[Callable[[], bool]],
+) -> Tuple[Dict[str, Any], Optional[Any]]:
+    """
+    Run extract -> transform -> COG write for a single (aoi, season, year,
+    variable) combination and return (result record, pending upload future).
+    Uploads are submitted to `upload_pool` so they overlap with other tasks;
+    the caller fills in "gcs_uri" when the future resolves. Raises on
+    failure; the caller records the error.
+    """
+    logger = logging.getLogger("orchestrator")
+
+    def _check_stop():
+        check_cancelled(should_stop)
+
+    logger.info(
+        "Processing variable %s for year %s season %s (AOI %s)",
+        var_name,
+        year,
+        season,
+        aoi_slug,
+    )
+    _notify(
+        progress_cb,
+        f"Processing {var_name} ({year}, {season}) for {aoi_slug}...",
+    )
+    extractor = var_def["extractor"]
+    transform_fn = var_def["transform"]
+
+    # Allocate a subfolder inside the shared per-job temp directory instead of
+    # creating (and tearing down) a fresh TemporaryDirectory per combination.
+    tmp_dir = Path(job_tmp) / f"{var_slug}_{year}_{season_slug}_{uuid.uuid4().hex}"
+    tmp_dir.mkdir()
+    try:
+        raw_result = extractor.extract(
+            aoi_geojson=geom_wgs84,
+            year=year,
+            season=season,
+            resolution_m=job_cfg.resolution_m,
+            temp_dir=tmp_dir,
+            progress_cb=progress_cb,
+            should_stop=should_stop,
+        )
+        # Allow extractors to optionally return (path, effective_resolution_m)
+        if isinstance(raw_result, tuple):
+            raw_path, effective_res = raw_result
+        else:
+            raw_path, effective_res = raw_result, job_cfg.resolution_m
+        _notify(
+            progress_cb,
+            f"{var_name} ({year}, {season}) {aoi_slug}: downloaded raw image {raw_path}",
+        )
+        _check_stop()
+
+        processed_path = transform_fn(
+            src_path=raw_path,
+            target_crs=job_cfg.target_crs,
+            resolution_m=effective_res,
+            aoi_geom_target=geom_target,
+        )
+        _notify(
+            progress_cb,
+            f"{var_name} ({year}, {season}) {aoi_slug}: transformed to target CRS/resolution",
+        )
+        _check_stop()
+
+        filename = f"{var_slug}_{year}_{season_slug}_{aoi_slug}.tif"
+        local_output = output_dir / filename
+        # One .part staging file per output; outputs are unique within a job,
+        # so no uuid suffix is needed to avoid collisions.
+        staging = local_output.with_suffix(local_output.suffix + ".part")
+
+        try:
+            write_cog(processed_path, staging)
+            _check_stop()
+            # Finalize the local output first; the finalized file is stable,
+            # so the background upload can safely read from it.
+            os.replace(staging, local_output)
+        finally:
+            staging.unlink(missing_ok=True)
+
+        upload_future = None
+        if job_cfg.storage.kind == "gcs_cog" and upload_pool is not None:
+            _check_stop()
+            upload_future = upload_pool.submit(
+                upload_to_gcs, local_output, job_cfg.storage.bucket, job_cfg.storage.prefix
+            )
+            _notify(
+                progress_cb,
+                f"{var_name} ({year}, {season}) {aoi_slug}: upload queued for {filename}",
+            )
+
+        _notify(
+            progress_cb,
+            f"{var_name} ({year}, {season}) {aoi_slug}: wrote COG {local_output}",
+        )
+        _check_stop()
+
+        logger.info(
+            "Finished variable %s for year %s season %s (AOI %s)",
+            var_name,
+            year,
+            season,
+            aoi_slug,
+        )
+        _notify(
+            progress_cb,
+            f"Finished {var_name} ({year}, {season}) for {aoi_slug}",
+        )
+        result = {
+            "aoi": aoi_slug,
+            "aoi_path": str(Path(aoi_path).resolve()),
+            "variable": var_name,
+            "year": year,
+            "season": season,
+            "local_path": str(local_output),
+            "gcs_uri": None,
+        }
+        return result, upload_future
+    finally:
+        # Best-effort cleanup. On Windows this can fail intermittently due to
+        # lingering file handles and must not fail a successful variable run.
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
 def _run(
     job_cfg,
     logging_cfg,
@@ -66,14 +237,25 @@ def _run(
     years = years_val or ([] if getattr(job_cfg, "year", None) is None else [job_cfg.year])
     seasons = seasons_val or ([] if getattr(job_cfg, "season", None) is None else [job_cfg.season])
     aois = aois_val or ([] if getattr(job_cfg, "aoi_path", None) is None else [job_cfg.aoi_path])
-    var_slug_map: Dict[str, str] = {}
+    # Slugs are job-invariant; compute them once instead of per combination.
+    var_slug_map: Dict[str, str] = {v: _slugify_name(v) for v in job_cfg.variables}
+    season_slug_map: Dict[str, str] = {s: _slugify_name(s) for s in seasons}
+    # Resolve each variable's extractor/transform once per job instead of per
+    # (aoi, season, year) combination; extractors are stateless across calls.
+    var_defs: Dict[str, Dict[str, Any]] = {
+        v: get_variable(v, job_cfg=job_cfg) for v in job_cfg.variables
+    }
 
     try:
+        # Collect all independent (aoi, season, year, variable) combinations
+        # up front; AOIs that fail to load are recorded and skipped as before.
+        tasks: List[Task] = []
         for aoi_path in aois:
             _check_stop()
             try:
-                aoi_gdf = load_aoi(aoi_path)
-                geom_wgs84, geom_target = get_aoi_geometries(aoi_gdf, job_cfg.target_crs)
+                geom_wgs84, geom_target = _load_aoi_cached(
+                    str(aoi_path), job_cfg.target_crs, os.path.getmtime(aoi_path)
+                )
                 aoi_slug = _slugify_name(Path(aoi_path).stem)
                 _notify(progress_cb, f"AOI loaded and reprojected: {aoi_slug}")
             except PipelineCancelled:
@@ -85,154 +267,115 @@ def _run(
                 continue
 
             for season in seasons:
-                _check_stop()
-                season_slug = _slugify_name(season)
                 for year in years:
-                    _check_stop()
                     for var_name in job_cfg.variables:
-                        _check_stop()
-                        if var_name not in var_slug_map:
-                            var_slug_map[var_name] = _slugify_name(var_name)
-                        var_slug = var_slug_map[var_name]
-                        logger.info(
-                            "Processing variable %s for year %s season %s (AOI %s)",
-                            var_name,
-                            year,
-                            season,
-                            aoi_slug,
-                        )
-                        _notify(
-                            progress_cb,
-                            f"Processing {var_name} ({year}, {season}) for {aoi_slug}...",
+                        tasks.append(
+                            (aoi_path, aoi_slug, geom_wgs84, geom_target, season, year, var_name)
                         )
-                        var_def = get_variable(var_name, job_cfg=job_cfg)
-                        extractor = var_def["extractor"]
-                        transform_fn = var_def["transform"]
-
-                        try:
-                            # On Windows, cleanup can fail intermittently due to lingering file handles.
-                            # Cleanup errors should not cause a successful variable run to be reported as failed.
-                            with tempfile.TemporaryDirectory(
-                                dir=output_dir, ignore_cleanup_errors=True
-                            ) as tmp_dir:
-                                raw_result = extractor.extract(
-                                    aoi_geojson=geom_wgs84,
-                                    year=year,
-                                    season=season,
-                                    resolution_m=job_cfg.resolution_m,
-                                    temp_dir=tmp_dir,
-                                    progress_cb=progress_cb,
-                                    should_stop=should_stop,
-                                )
-                                # Allow extractors to optionally return (path, effective_resolution_m)
-                                if isinstance(raw_result, tuple):
-                                    raw_path, effective_res = raw_result
-                                else:
-                                    raw_path, effective_res = raw_result, job_cfg.resolution_m
-                                _notify(
-                                    progress_cb,
-                                    f"{var_name} ({year}, {season}) {aoi_slug}: downloaded raw image {raw_path}",
-                                )
-                                _check_stop()
 
-                                processed_path = transform_fn(
-                                    src_path=raw_path,
-                                    target_crs=job_cfg.target_crs,
-                                    resolution_m=effective_res,
-                                    aoi_geom_target=geom_target,
+        max_workers = job_cfg.max_workers or DEFAULT_MAX_WORKERS
+        pending_uploads: List[Tuple[Dict[str, Any], Any]] = []
+        # One TemporaryDirectory for the whole job; tasks allocate subfolders
+        # inside it, amortizing creation/teardown across combinations. On
+        # Windows cleanup can fail intermittently due to lingering file
+        # handles, hence ignore_cleanup_errors.
+        with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as upload_pool:
+            try:
+                with tempfile.TemporaryDirectory(
+                    dir=output_dir, ignore_cleanup_errors=True
+                ) as job_tmp, ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    futures = {
+                        executor.submit(
+                            _process_one,
+                            job_cfg,
+                            output_dir,
+                            Path(job_tmp),
+                            aoi_path,
+                            aoi_slug,
+                            geom_wgs84,
+                            geom_target,
+                            season,
+                            season_slug_map[season],
+                            year,
+                            var_name,
+                            var_slug_map[var_name],
+                            var_defs[var_name],
+                            upload_pool,
+                            progress_cb,
+                            should_stop,
+                        ): (aoi_slug, aoi_path, season, year, var_name)
+                        for aoi_path, aoi_slug, geom_wgs84, geom_target, season, year, var_name in tasks
+                    }
+                    try:
+                        for future in as_completed(futures):
+                            aoi_slug, aoi_path, season, year, var_name = futures[future]
+                            try:
+                                result, upload_future = future.result()
+                            except PipelineCancelled:
+                                raise
+                            except Exception as exc:
+                                logger.exception(
+                                    "Failed variable %s for year %s season %s (AOI %s)",
+                                    var_name,
+                                    year,
+                                    season,
+                                    aoi_slug,
                                 )
                                 _notify(
                                     progress_cb,
-                                    f"{var_name} ({year}, {season}) {aoi_slug}: transformed to target CRS/resolution",
+                                    f"Failed {var_name} ({year}, {season}) for {aoi_slug}: {exc}",
                                 )
-                                _check_stop()
-
-                                filename = f"{var_slug}_{year}_{season_slug}_{aoi_slug}.tif"
-                                local_output = output_dir / filename
-                                tmp_output = output_dir / f".{filename}.{uuid.uuid4().hex}.tmp.tif"
-
-                                gcs_uri = None
-                                try:
-                                    write_cog(processed_path, tmp_output)
-                                    _check_stop()
-
-                                    if job_cfg.storage.kind == "gcs_cog":
-                                        _check_stop()
-                                        gcs_uri = upload_to_gcs(
-                                            tmp_output, job_cfg.storage.bucket, job_cfg.storage.prefix
-                                        )
-                                        logger.info("Uploaded to GCS: %s", gcs_uri)
-                                        _notify(
-                                            progress_cb,
-                                            f"{var_name} ({year}, {season}) {aoi_slug}: uploaded to {gcs_uri}",
-                                        )
-                                        _check_stop()
-
-                                    # Finalize the local output only after all required steps succeed
-                                    # (e.g., upload for gcs_cog), so incomplete runs don't leave outputs behind.
-                                    tmp_output.replace(local_output)
-                                finally:
-                                    if tmp_output.exists():
-                                        try:
-                                            tmp_output.unlink()
-                                        except Exception:
-                                            pass
-
-                                _notify(
-                                    progress_cb,
-                                    f"{var_name} ({year}, {season}) {aoi_slug}: wrote COG {local_output}",
-                                )
-                                _check_stop()
-
-                                results.append(
+                                errors.append(
                                     {
                                         "aoi": aoi_slug,
-                                        "aoi_path": str(Path(aoi_path).resolve()),
+                                        "aoi_path": str(aoi_path),
                                         "variable": var_name,
                                         "year": year,
                                         "season": season,
-                                        "local_path": str(local_output),
-                                        "gcs_uri": gcs_uri,
+                                        "error": str(exc),
                                     }
                                 )
-                                logger.info(
-                                    "Finished variable %s for year %s season %s (AOI %s)",
-                                    var_name,
-                                    year,
-                                    season,
-                                    aoi_slug,
-                                )
-                                _notify(
-                                    progress_cb,
-                                    f"Finished {var_name} ({year}, {season}) for {aoi_slug}",
-                                )
-                        except PipelineCancelled:
-                            logger.info("Pipeline cancelled by user.")
-                            _notify(progress_cb, "Pipeline stopped by user.")
-                            raise
-                        except Exception as exc:
-                            logger.exception(
-                                "Failed variable %s for year %s season %s (AOI %s)",
-                                var_name,
-                                year,
-                                season,
-                                aoi_slug,
-                            )
-                            _notify(
-                                progress_cb,
-                                f"Failed {var_name} ({year}, {season}) for {aoi_slug}: {exc}",
-                            )
-                            errors.append(
-                                {
-                                    "aoi": aoi_slug,
-                                    "aoi_path": str(aoi_path),
-                                    "variable": var_name,
-                                    "year": year,
-                                    "season": season,
-                                    "error": str(exc),
-                                }
-                            )
-                            continue
+                                continue
+                            results.append(result)
+                            if upload_future is not None:
+                                pending_uploads.append((result, upload_future))
+                            _check_stop()
+                    except PipelineCancelled:
+                        # Drop queued tasks; running ones notice should_stop themselves.
+                        executor.shutdown(cancel_futures=True)
+                        raise
+
+                # Drain uploads that were still in flight when the last task
+                # finished, filling in each result's gcs_uri.
+                for result, upload_future in pending_uploads:
+                    _check_stop()
+                    try:
+                        gcs_uri = upload_future.result()
+                    except PipelineCancelled:
+                        raise
+                    except Exception as exc:
+                        logger.exception("Upload failed for %s", result["local_path"])
+                        _notify(
+                            progress_cb,
+                            f"Upload failed for {result['local_path']}: {exc}",
+                        )
+                        errors.append(
+                            {
+                                "aoi": result["aoi"],
+                                "aoi_path": result["aoi_path"],
+                                "variable": result["variable"],
+                                "year": result["year"],
+                                "season": result["season"],
+                                "error": str(exc),
+                            }
+                        )
+                        continue
+                    result["gcs_uri"] = gcs_uri
+                    logger.info("Uploaded to GCS: %s", gcs_uri)
+                    _notify(progress_cb, f"Uploaded to {gcs_uri}")
+            except PipelineCancelled:
+                upload_pool.shutdown(cancel_futures=True)
+                raise
     except PipelineCancelled:
         logger.info("Pipeline cancelled by user.")
         _notify(progress_cb, "Pipeline stopped by user.")
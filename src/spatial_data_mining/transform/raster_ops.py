@@ -1,22 +1,81 @@
+import functools
 import logging
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+import numpy as np
 import rioxarray
 import rasterio
 from rasterio.io import MemoryFile
-from rasterio.mask import mask
 from pyproj import Transformer
+from rasterio.crs import CRS
 from rasterio.enums import Resampling
+from rasterio.vrt import WarpedVRT
 from rasterio.warp import calculate_default_transform
+from rasterio.windows import Window, from_bounds
+from shapely import wkb as shp_wkb
 from shapely.geometry import mapping, box
 from shapely.ops import transform as shp_transform
+from shapely.prepared import prep
+
+try:  # dask is optional; with it, reads and writes stream chunk-by-chunk
+    import dask  # noqa: F401
+
+    HAS_DASK = True
+except ImportError:
+    HAS_DASK = False
 
 logger = logging.getLogger(__name__)
 
 # Standard nodata value used across all outputs.
 NODATA_VALUE = -9999
 
+# Warp defaults: keep one core free for the rest of the pipeline and give the
+# warp kernel a larger working buffer than GDAL's small default.
+DEFAULT_WARP_THREADS = max((os.cpu_count() or 2) - 1, 1)
+DEFAULT_WARP_MEM_MB = 512
+
+# Maximum approximation error of the warp transformer, in source pixels.
+# 0.125 px is GDAL's own default for warped VRTs and is visually
+# indistinguishable for bilinear/nearest resampling.
+WARP_APPROX_MAX_ERROR = 0.125
+
+# GeoTIFF write defaults. ZSTD level 1 compresses several times faster than
+# deflate at equal-or-smaller size, and 512px tiles line up with the COG
+# block size so downstream windowed reads touch a single block.
+DEFAULT_COMPRESS = "zstd"
+DEFAULT_ZSTD_LEVEL = 1
+DEFAULT_BLOCKSIZE = 512
+
+# Chunk size for dask-backed reads/writes; one chunk bounds peak memory.
+DASK_CHUNK = 1024
+
+# Internal overview decimation factors for processed rasters.
+OVERVIEW_FACTORS = [2, 4, 8, 16, 32]
+
+# GDAL block cache for the processing session, in MB. The 40 MB default
+# thrashes on the rasters this pipeline moves; 1 GB keeps source blocks
+# resident between the read, warp, and write stages.
+GDAL_CACHE_MB = 1024
+
+
+def _gdal_env(num_threads: int | str = "ALL_CPUS") -> rasterio.Env:
+    """GDAL session tuned for large rasters: big block cache, threaded codecs,
+    no directory scans on open, and VSI caching for remote/VRT sources.
+    `num_threads` caps GDAL's warp/codec threads — process_many workers pass
+    a small value so N processes do not each spin up ALL_CPUS threads."""
+    return rasterio.Env(
+        GDAL_CACHEMAX=GDAL_CACHE_MB,
+        GDAL_NUM_THREADS=str(num_threads),
+        GDAL_DISABLE_READDIR_ON_OPEN="EMPTY_DIR",
+        VSI_CACHE=True,
+        VSI_CACHE_SIZE=256 * 1024 * 1024,
+        CPL_VSIL_CURL_ALLOWED_EXTENSIONS=".tif,.tiff,.vrt",
+    )
+
 
 def _standardize_nodata(data, nodata_value: float | int = NODATA_VALUE):
     """
@@ -39,6 +98,18 @@ def _normalize_spatial_dims(data):
     """
     Ensure rioxarray data uses x/y spatial dims even if named differently.
     """
+    # Fast path: rioxarray already delivers x/y-named dims in the common case,
+    # so skip the squeeze/rename machinery when there is nothing to normalize.
+    dims = data.dims
+    sizes = data.sizes
+    if (
+        "x" in dims
+        and "y" in dims
+        and not ("band" in dims and sizes["band"] == 1)
+        and not ("variable" in dims and sizes["variable"] == 1)
+    ):
+        return data
+
     # Only squeeze non-spatial singleton dims (e.g., band), keep spatial dims even if size 1.
     if "band" in data.dims and data.sizes.get("band", 0) == 1:
         data = data.squeeze("band", drop=True)
@@ -64,10 +135,79 @@ def _normalize_spatial_dims(data):
     return data.rio.set_spatial_dims(x_dim="x", y_dim="y", inplace=False)
 
 
-def _reproject_raster(data, target_crs: str, resolution_m: float | None, resampling: Resampling):
+@functools.lru_cache(maxsize=64)
+def _cached_transformer(src_crs: str, dst_crs: str) -> Transformer:
+    """Memoized pyproj transformer; building one costs a PROJ pipeline setup."""
+    return Transformer.from_crs(src_crs, dst_crs, always_xy=True)
+
+
+@functools.lru_cache(maxsize=256)
+def _cached_default_transform(
+    src_crs_wkt: str,
+    dst_crs: str,
+    width: int,
+    height: int,
+    left: float,
+    bottom: float,
+    right: float,
+    top: float,
+):
+    """
+    Memoized calculate_default_transform preserving the source pixel counts.
+    Adjacent tiles of the same product share CRS pair, shape, and (rounded)
+    bounds, so the PROJ setup behind the transform is paid once per grid.
+    """
+    return calculate_default_transform(
+        CRS.from_wkt(src_crs_wkt),
+        dst_crs,
+        width,
+        height,
+        left,
+        bottom,
+        right,
+        top,
+        dst_width=width,
+        dst_height=height,
+    )
+
+
+def _reproject_raster(
+    data,
+    target_crs: str,
+    resolution_m: float | None,
+    resampling: Resampling,
+    num_threads: int | None = None,
+    warp_mem_limit: int = DEFAULT_WARP_MEM_MB,
+):
+    """
+    Reproject to `target_crs` under a GDAL env tuned for the warp: threaded
+    codecs and no CHECK_WITH_INVERT_PROJ verification round-trip. The
+    approximate transformer (WARP_APPROX_MAX_ERROR) only applies on the
+    fused WarpedVRT path; rio.reproject has no tolerance passthrough, so
+    this multi-pass fallback uses the exact transformer.
+    """
+    # Identity warp is pure wasted bandwidth: when the source already sits in
+    # the target CRS at the requested (or native) resolution, return it as-is.
+    try:
+        src_crs = data.rio.crs
+        if src_crs is not None and CRS.from_user_input(target_crs) == src_crs:
+            if resolution_m is None or abs(abs(data.rio.resolution()[0]) - resolution_m) < 1e-6:
+                return data
+    except Exception as exc:
+        logger.warning("Same-CRS fast-path check failed (%s); warping normally", exc)
+
+    # Keep multi-band rasters (e.g. 64-band AlphaEarth embeddings) in
+    # (band, y, x) order so rioxarray hands rasterio one 3D warp call; the
+    # transformer setup is then amortized across all bands instead of being
+    # rebuilt per band.
+    if "band" in data.dims and data.sizes.get("band", 0) > 1 and data.dims != ("band", "y", "x"):
+        data = data.transpose("band", "y", "x")
+
     reproject_kwargs = {
         "dst_crs": target_crs,
         "resampling": resampling,
+        "num_threads": num_threads if num_threads is not None else DEFAULT_WARP_THREADS,
+        "warp_mem_limit": warp_mem_limit,
     }
     if resolution_m is not None:
         reproject_kwargs["resolution"] = resolution_m
@@ -75,34 +215,70 @@ def _reproject_raster(data, target_crs: str, resolution_m: float | None, resampl
         # Preserve native pixel grid: compute destination transform/shape matching source pixel counts.
         try:
             with data.rio.env():
-                transform, width, height = calculate_default_transform(
-                    data.rio.crs,
+                bounds = data.rio.bounds()
+                transform, width, height = _cached_default_transform(
+                    data.rio.crs.to_wkt(),
                     target_crs,
                     data.rio.width,
                     data.rio.height,
-                    *data.rio.bounds(),
-                    dst_width=data.rio.width,
-                    dst_height=data.rio.height,
+                    # round for a stable cache key; 1e-6 is sub-millimetre in
+                    # projected units and ~0.1m in degrees
+                    round(bounds[0], 6),
+                    round(bounds[1], 6),
+                    round(bounds[2], 6),
+                    round(bounds[3], 6),
                 )
             reproject_kwargs["transform"] = transform
             reproject_kwargs["shape"] = (height, width)
         except Exception as exc:
             logger.warning("Falling back to default transform when preserving native grid: %s", exc)
 
-    return data.rio.reproject(**reproject_kwargs)
+    # CHECK_WITH_INVERT_PROJ adds a verification round-trip per transform
+    # that the warp does not need; threading covers the compression side.
+    with rasterio.Env(GDAL_NUM_THREADS="ALL_CPUS", CHECK_WITH_INVERT_PROJ="NO"):
+        return data.rio.reproject(**reproject_kwargs)
+
+
+# Identity-keyed cache of per-AOI clip artifacts. The orchestrator reuses the
+# same geometry object for every variable/year/season of an AOI, so keying by
+# id() (with the live geometry retained to keep the id valid) avoids
+# rebuilding the GeoJSON mapping and the GEOS prepared geometry per raster.
+_AOI_PAYLOAD_CACHE: Dict[int, Tuple[Any, Any, Any]] = {}
+_AOI_PAYLOAD_MAX = 8
+
+
+def _aoi_payload(geom: Any) -> Tuple[Any, Any]:
+    """Return (geojson_mapping, prepared_geom) for `geom`, cached by identity."""
+    cached = _AOI_PAYLOAD_CACHE.get(id(geom))
+    if cached is not None and cached[0] is geom:
+        return cached[1], cached[2]
+    if len(_AOI_PAYLOAD_CACHE) >= _AOI_PAYLOAD_MAX:
+        _AOI_PAYLOAD_CACHE.clear()
+    geojson = mapping(geom)
+    prepared = prep(geom)
+    _AOI_PAYLOAD_CACHE[id(geom)] = (geom, geojson, prepared)
+    return geojson, prepared
 
 
 def _clip_to_aoi(data, target_crs: str, aoi_geom_target: Any):
-    aoi_geom = aoi_geom_target
+    aoi_geojson, aoi_prepared = _aoi_payload(aoi_geom_target)
+    raster_box = None
+    try:
+        # When the AOI fully contains the raster there is nothing to mask;
+        # skip the whole rasterization pass.
+        raster_box = box(*data.rio.bounds())
+        if aoi_prepared.contains(raster_box):
+            return data
+    except Exception as exc:
+        logger.warning("Containment fast-path check failed; clipping normally (%s)", exc)
     try:
-        return data.rio.clip([mapping(aoi_geom)], target_crs, drop=True)
+        return data.rio.clip([aoi_geojson], target_crs, drop=True)
     except Exception as exc:
         logger.warning("Clip failed (%s); retrying with all_touched=True", exc)
         try:
-            return data.rio.clip([mapping(aoi_geom)], target_crs, drop=True, all_touched=True)
+            return data.rio.clip([aoi_geojson], target_crs, drop=True, all_touched=True)
         except Exception as exc2:
-            raster_box = box(*data.rio.bounds())
-            if not raster_box.intersects(aoi_geom):
+            if raster_box is None or not aoi_prepared.intersects(raster_box):
                 raise
             logger.warning("Clip failed again (%s); writing un-clipped raster as fallback", exc2)
             return data
@@ -114,7 +290,7 @@ def _clip_to_source_aoi(data, target_crs: str, aoi_geom_target: Any):
     Falls back silently if any step fails.
     """
     try:
-        transformer = Transformer.from_crs(target_crs, data.rio.crs, always_xy=True)
+        transformer = _cached_transformer(target_crs, data.rio.crs.to_wkt())
         aoi_geom_src = shp_transform(transformer.transform, aoi_geom_target)
         return _clip_to_aoi(data, data.rio.crs, aoi_geom_src)
     except Exception as exc:
@@ -122,43 +298,249 @@ def _clip_to_source_aoi(data, target_crs: str, aoi_geom_target: Any):
         return data
 
 
-def _read_raster_clipped(src_path: Path, target_crs: str, aoi_geom_target: Any):
+def _read_raster_clipped(
+    src_path: Path | str, target_crs: str, aoi_geom_target: Any, masked: bool = True
+):
     """
     Read only the AOI footprint from the source raster to avoid loading huge scenes.
-    Falls back to a full read if anything goes wrong.
+    Falls back to a full read if anything goes wrong. With masked=False the
+    source dtype is preserved (no NaN-hosting float upcast) and nodata stays
+    the raster's own sentinel value.
     """
     try:
         with rasterio.open(src_path) as src:
             src_crs = src.crs
             if src_crs is None:
                 raise ValueError("Source raster has no CRS")
-            transformer = Transformer.from_crs(target_crs, src_crs, always_xy=True)
+            transformer = _cached_transformer(target_crs, src_crs.to_wkt())
             aoi_geom_src = shp_transform(transformer.transform, aoi_geom_target)
             if not box(*src.bounds).intersects(aoi_geom_src):
                 raise ValueError("AOI does not intersect source raster")
 
-            data, transform = mask(
-                src,
-                [mapping(aoi_geom_src)],
-                crop=True,
-                filled=True,
-                nodata=src.nodata,
-            )
+            # Read the bounding window instead of rasterio.mask: the exact
+            # polygon clip happens later in the target CRS anyway, so
+            # rasterizing the AOI here only burned CPU — the window gives the
+            # same I/O saving without it.
+            window = from_bounds(*aoi_geom_src.bounds, transform=src.transform)
+            window = window.round_offsets().round_lengths()
+            window = window.intersection(Window(0, 0, src.width, src.height))
+            if window.width <= 0 or window.height <= 0:
+                raise ValueError("AOI window does not overlap source raster")
+            data = src.read(window=window)
             profile = src.profile
             profile.update(
                 height=data.shape[1],
                 width=data.shape[2],
-                transform=transform,
+                transform=src.window_transform(window),
                 driver="GTiff",
             )
 
         with MemoryFile() as memfile:
             with memfile.open(**profile) as dst:
                 dst.write(data)
-            return rioxarray.open_rasterio(memfile, masked=True).load()
+            return rioxarray.open_rasterio(memfile, masked=masked).load()
     except Exception as exc:
         logger.warning("Read+crop in source CRS failed for %s; falling back to full read (%s)", src_path, exc)
-        return rioxarray.open_rasterio(src_path, masked=True)
+        if HAS_DASK:
+            # Lazy chunked read: downstream steps pull one chunk at a time
+            # instead of materializing the whole scene up front.
+            return rioxarray.open_rasterio(
+                src_path, masked=masked, chunks={"y": DASK_CHUNK, "x": DASK_CHUNK}, lock=False
+            )
+        return rioxarray.open_rasterio(src_path, masked=masked)
+
+
+def _warp_read_to_target(
+    src_path: Path | str,
+    target_crs: str,
+    resolution_m: float | None,
+    aoi_geom_target: Any,
+    resampling: Resampling,
+    num_threads: int | None = None,
+    warp_mem_limit: int = DEFAULT_WARP_MEM_MB,
+    masked: bool = True,
+):
+    """
+    Open the source through a WarpedVRT in the target CRS and read only the
+    AOI window — one streamed pass instead of materializing a full-extent
+    reprojection and clipping afterwards. Returns None when the fused path
+    cannot be used so callers can fall back to the multi-pass pipeline.
+    """
+    try:
+        with rasterio.open(src_path) as src:
+            if src.crs is None:
+                raise ValueError("Source raster has no CRS")
+            vrt_kwargs = {
+                "crs": target_crs,
+                "resampling": resampling,
+                # approximate transformer error bound, in source pixels
+                "tolerance": WARP_APPROX_MAX_ERROR,
+                "warp_mem_limit": warp_mem_limit,
+                # extra keywords become GDAL warp options via **warp_extras
+                "NUM_THREADS": str(
+                    num_threads if num_threads is not None else DEFAULT_WARP_THREADS
+                ),
+            }
+            if resolution_m is not None:
+                transform, width, height = calculate_default_transform(
+                    src.crs,
+                    target_crs,
+                    src.width,
+                    src.height,
+                    *src.bounds,
+                    resolution=resolution_m,
+                )
+                vrt_kwargs.update(transform=transform, width=width, height=height)
+
+            with WarpedVRT(src, **vrt_kwargs) as vrt:
+                window = from_bounds(*aoi_geom_target.bounds, transform=vrt.transform)
+                window = window.round_offsets().round_lengths()
+                window = window.intersection(Window(0, 0, vrt.width, vrt.height))
+                if window.width <= 0 or window.height <= 0:
+                    raise ValueError("AOI does not intersect the warped source")
+                data = vrt.read(window=window)
+                profile = vrt.profile
+                profile.update(
+                    height=data.shape[1],
+                    width=data.shape[2],
+                    transform=vrt.window_transform(window),
+                    driver="GTiff",
+                )
+
+        with MemoryFile() as memfile:
+            with memfile.open(**profile) as dst:
+                dst.write(data)
+            return rioxarray.open_rasterio(memfile, masked=masked).load()
+    except Exception as exc:
+        logger.warning(
+            "Fused warp+clip failed for %s; falling back to multi-pass pipeline (%s)",
+            src_path,
+            exc,
+        )
+        return None
+
+
+def _prepare_target_data(
+    src_path: Path | str,
+    target_crs: str,
+    resolution_m: float | None,
+    aoi_geom_target: Any,
+    resampling: Resampling,
+    num_threads: int | None = None,
+    warp_mem_limit: int = DEFAULT_WARP_MEM_MB,
+    masked: bool = True,
+):
+    """
+    Shared read -> reproject -> clip front end for the process_* functions.
+    Prefers the fused WarpedVRT pass; falls back to the original
+    read/clip/reproject sequence when the fused path is unavailable.
+
+    With masked=False the data keeps its native (integer) dtype, which may
+    not be able to represent NODATA_VALUE: no nodata standardization happens
+    and the AOI polygon clip is left to the caller, which must widen the
+    dtype first so the clip's exterior fill stays representable.
+    """
+    data = _warp_read_to_target(
+        src_path,
+        target_crs,
+        resolution_m,
+        aoi_geom_target,
+        resampling,
+        num_threads=num_threads,
+        warp_mem_limit=warp_mem_limit,
+        masked=masked,
+    )
+    if data is None:
+        data = _read_raster_clipped(src_path, target_crs, aoi_geom_target, masked=masked)
+        data = _normalize_spatial_dims(data)
+        if masked:
+            data = _standardize_nodata(data)
+        data = _clip_to_source_aoi(data, target_crs, aoi_geom_target)
+        data = _reproject_raster(
+            data,
+            target_crs,
+            resolution_m,
+            resampling,
+            num_threads=num_threads,
+            warp_mem_limit=warp_mem_limit,
+        )
+    else:
+        data = _normalize_spatial_dims(data)
+        if masked:
+            data = _standardize_nodata(data)
+    if not masked:
+        return data
+    return _clip_to_aoi(data, target_crs, aoi_geom_target)
+
+
+def _write_geotiff(
+    data,
+    path: Path | str,
+    compress: str = DEFAULT_COMPRESS,
+    blocksize: int = DEFAULT_BLOCKSIZE,
+    driver: str = "GTiff",
+    overview_resampling: str = "average",
+) -> None:
+    """
+    Write a tiled GeoTIFF with a horizontal (int) or floating-point predictor
+    so runs of similar values compress well. With driver="COG" the GDAL COG
+    driver lays out IFD-first tiles and builds the overview pyramid in the
+    same streaming pass, matching load/cog.write_cog. Falls back to a plain
+    deflate write if the GDAL build lacks the driver or codec.
+    """
+    if driver == "COG":
+        write_kwargs = dict(
+            driver="COG",
+            compress=compress,
+            blocksize=blocksize,
+            predictor=2 if np.issubdtype(data.dtype, np.integer) else 3,
+            overview_resampling=overview_resampling,
+            num_threads="all_cpus",
+            bigtiff="IF_SAFER",
+        )
+        if compress == "zstd":
+            write_kwargs["level"] = DEFAULT_ZSTD_LEVEL
+    else:
+        write_kwargs = dict(
+            compress=compress,
+            tiled=True,
+            blockxsize=blocksize,
+            blockysize=blocksize,
+            predictor=2 if np.issubdtype(data.dtype, np.integer) else 3,
+            num_threads="all_cpus",
+            BIGTIFF="IF_SAFER",
+        )
+        if compress == "zstd":
+            write_kwargs["zstd_level"] = DEFAULT_ZSTD_LEVEL
+    if HAS_DASK:
+        # Stream the write block-by-block so peak memory is one chunk, not the
+        # full raster. A plain per-file threading.Lock keeps rasterio's writes
+        # serialized and the compressed blocks aligned.
+        if not data.chunks:
+            data = data.chunk({"y": DASK_CHUNK, "x": DASK_CHUNK})
+        write_kwargs["lock"] = threading.Lock()
+    try:
+        data.rio.to_raster(path, **write_kwargs)
+    except Exception as exc:
+        logger.warning("Write with compress=%s failed (%s); retrying with deflate", compress, exc)
+        data.rio.to_raster(path, compress="deflate")
+
+
+def _build_overviews(path: Path | str, resampling: Resampling) -> None:
+    """
+    Add an internal overview pyramid in place so coarse-scale reads decode
+    decimated levels instead of the full-resolution raster. Best-effort: a
+    failure leaves a valid overview-less file.
+    """
+    try:
+        with rasterio.open(path, "r+") as dst:
+            factors = [f for f in OVERVIEW_FACTORS if min(dst.width, dst.height) >= f]
+            if not factors:
+                return
+            dst.build_overviews(factors, resampling)
+            dst.update_tags(ns="rio_overview", resampling=resampling.name)
+    except Exception as exc:
+        logger.warning("Could not build overviews for %s: %s", path, exc)
 
 
 def process_raster_to_target(
@@ -166,6 +548,12 @@ def process_raster_to_target(
     target_crs: str,
     resolution_m: float | None,
     aoi_geom_target: Any,
+    num_threads: int | None = None,
+    warp_mem_limit: int = DEFAULT_WARP_MEM_MB,
+    compress: str = DEFAULT_COMPRESS,
+    blocksize: int = DEFAULT_BLOCKSIZE,
+    build_overviews: bool = True,
+    driver: str = "GTiff",
 ) -> Path:
     """
     Reproject, resample, and clip to the target AOI/CRS.
@@ -173,25 +561,106 @@ def process_raster_to_target(
     """
     src_path = Path(src_path)
     processed_path = src_path.with_name(f"{src_path.stem}_processed.tif")
+    # Stringify once; every rasterio/rioxarray call below would otherwise
+    # re-run Path.__fspath__ inside GDAL's filename handling.
+    src_str = os.fspath(src_path)
+    processed_str = os.fspath(processed_path)
 
-    data = _read_raster_clipped(src_path, target_crs, aoi_geom_target)
-    data = _normalize_spatial_dims(data)
-    data = _standardize_nodata(data)
-    data = _clip_to_source_aoi(data, target_crs, aoi_geom_target)
-    data = _reproject_raster(data, target_crs, resolution_m, Resampling.bilinear)
-    data = _clip_to_aoi(data, target_crs, aoi_geom_target)
-    data = _standardize_nodata(data)
+    with _gdal_env(num_threads if num_threads is not None else "ALL_CPUS"):
+        data = _prepare_target_data(
+            src_str,
+            target_crs,
+            resolution_m,
+            aoi_geom_target,
+            Resampling.bilinear,
+            num_threads=num_threads,
+            warp_mem_limit=warp_mem_limit,
+        )
+        data = _standardize_nodata(data)
 
-    data.rio.to_raster(processed_path, compress="deflate")
+        _write_geotiff(
+            data,
+            processed_str,
+            compress=compress,
+            blocksize=blocksize,
+            driver=driver,
+            overview_resampling="average",
+        )
+        if build_overviews and driver != "COG":  # the COG driver embeds overviews itself
+            _build_overviews(processed_str, Resampling.average)
 
     return processed_path
 
 
+def _process_many_worker(
+    transform_fn: Callable,
+    src_path: str,
+    target_crs: str,
+    resolution_m: float | None,
+    aoi_wkb: bytes,
+    kwargs: Dict[str, Any],
+) -> Path:
+    aoi_geom = shp_wkb.loads(aoi_wkb)
+    # Each worker owns a core already; two warp threads per process keep the
+    # codec busy without oversubscribing the box.
+    kwargs.setdefault("num_threads", 2)
+    with rasterio.Env(GDAL_NUM_THREADS=2):
+        return transform_fn(Path(src_path), target_crs, resolution_m, aoi_geom, **kwargs)
+
+
+def process_many(
+    paths: List[Path],
+    transform_fn: Callable,
+    target_crs: str,
+    resolution_m: float | None,
+    aoi_geom_target: Any,
+    max_workers: int | None = None,
+    **kwargs,
+) -> List[Optional[Path]]:
+    """
+    Run `transform_fn` over several source rasters in parallel worker
+    processes, sidestepping the GIL for the numpy/recode portions that the
+    orchestrator's thread pool cannot overlap. The AOI travels as WKB so the
+    pickled task stays small. Returns processed paths aligned with `paths`;
+    a failed raster is logged and left as None rather than aborting the rest.
+    """
+    if not paths:
+        return []
+    aoi_wkb = shp_wkb.dumps(aoi_geom_target)
+    results: List[Optional[Path]] = [None] * len(paths)
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(
+                _process_many_worker,
+                transform_fn,
+                os.fspath(p),
+                target_crs,
+                resolution_m,
+                aoi_wkb,
+                dict(kwargs),
+            ): i
+            for i, p in enumerate(paths)
+        }
+        for fut in as_completed(futures):
+            i = futures[fut]
+            try:
+                results[i] = fut.result()
+            except Exception as exc:
+                logger.warning("Processing failed for %s: %s", paths[i], exc)
+    return results
+
+
 def process_clcplus_to_target(
     src_path: Path,
     target_crs: str,
     resolution_m: float | None,
     aoi_geom_target: Any,
+    num_threads: int | None = None,
+    warp_mem_limit: int = DEFAULT_WARP_MEM_MB,
+    compress: str = DEFAULT_COMPRESS,
+    blocksize: int = DEFAULT_BLOCKSIZE,
+    build_overviews: bool = True,
+    driver: str = "GTiff",
 ) -> Path:
     """
     Reproject CLCplus rasters with nearest-neighbor resampling, clip to AOI,
@@ -199,23 +668,65 @@ def process_clcplus_to_target(
     """
     src_path = Path(src_path)
     processed_path = src_path.with_name(f"{src_path.stem}_processed.tif")
+    # Stringify once; every rasterio/rioxarray call below would otherwise
+    # re-run Path.__fspath__ inside GDAL's filename handling.
+    src_str = os.fspath(src_path)
+    processed_str = os.fspath(processed_path)
 
-    data = _read_raster_clipped(src_path, target_crs, aoi_geom_target)
-    data = _normalize_spatial_dims(data)
-    data = _standardize_nodata(data)
-    data = _clip_to_source_aoi(data, target_crs, aoi_geom_target)
-    data = _reproject_raster(data, target_crs, resolution_m, Resampling.nearest)
-    data = _clip_to_aoi(data, target_crs, aoi_geom_target)
+    with _gdal_env(num_threads if num_threads is not None else "ALL_CPUS"):
+        # Track the source sentinel up front; reading unmasked below keeps the
+        # raster in its native integer dtype instead of the NaN-hosting
+        # float64 that masked=True forces, quartering warp memory bandwidth.
+        try:
+            with rasterio.open(src_str) as src:
+                src_nodata = src.nodata
+        except Exception:
+            src_nodata = None
 
-    # Recode nodata and zero values to NODATA_VALUE and preserve integer semantics.
-    data = data.fillna(NODATA_VALUE)
-    data = data.where(data != 0, other=NODATA_VALUE)
-    try:
-        data = data.astype("int32")
-        data.rio.write_nodata(NODATA_VALUE, inplace=True)
-    except Exception as exc:  # best-effort typing/nodata; continue even if write_nodata fails
-        logger.warning("Could not enforce nodata/%s typing on CLCplus raster: %s", NODATA_VALUE, exc)
+        data = _prepare_target_data(
+            src_str,
+            target_crs,
+            resolution_m,
+            aoi_geom_target,
+            Resampling.nearest,
+            num_threads=num_threads,
+            warp_mem_limit=warp_mem_limit,
+            masked=False,
+        )
+
+        # Recode nodata and zero values to NODATA_VALUE in a single numpy pass;
+        # the fillna/where/astype chain walked the array three times and allocated
+        # a new copy at each step.
+        arr = data.values
+        invalid = arr == 0
+        if src_nodata is not None:
+            invalid |= arr == src_nodata
+        if np.issubdtype(arr.dtype, np.floating):
+            invalid |= np.isnan(arr)
+        out = arr.astype(np.int32, copy=False)
+        out[invalid] = NODATA_VALUE
+        data = data.copy(data=out)
+        try:
+            data.rio.write_nodata(NODATA_VALUE, inplace=True)
+        except Exception as exc:  # best-effort nodata; continue even if write_nodata fails
+            logger.warning("Could not enforce nodata=%s on CLCplus raster: %s", NODATA_VALUE, exc)
+
+        # Clip only after the int32 recode: with the unmasked read the data
+        # was in its native dtype until here, which cannot hold NODATA_VALUE,
+        # so an earlier clip would wrap the exterior fill to an in-range
+        # class code.
+        data = _clip_to_aoi(data, target_crs, aoi_geom_target)
 
-    data.rio.to_raster(processed_path, compress="deflate")
+        _write_geotiff(
+            data,
+            processed_str,
+            compress=compress,
+            blocksize=blocksize,
+            driver=driver,
+            overview_resampling="nearest",
+        )
+        if build_overviews and driver != "COG":  # the COG driver embeds overviews itself
+            # Nearest keeps the categorical class codes intact in the pyramid.
+            _build_overviews(processed_str, Resampling.nearest)
 
     return processed_path
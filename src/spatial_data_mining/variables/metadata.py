@@ -1,3 +1,5 @@
+from types import MappingProxyType
+
 VARIABLE_METADATA = {
     "ndvi": {
         "source": "COPERNICUS/S2_SR_HARMONIZED",
@@ -55,7 +57,15 @@ VARIABLE_METADATA = {
     },
 }
 
+# Freeze the entries once at import: keys are normalized to lowercase and each
+# metadata dict becomes a read-only view, so callers can share them across
+# threads without defensive copies.
+VARIABLE_METADATA = MappingProxyType(
+    {k.lower(): MappingProxyType(v) for k, v in VARIABLE_METADATA.items()}
+)
+
+_EMPTY = MappingProxyType({})
+
 
 def get_variable_metadata(name: str) -> dict:
-    key = name.lower()
-    return VARIABLE_METADATA.get(key, {})
+    return VARIABLE_METADATA.get(name.lower(), _EMPTY)
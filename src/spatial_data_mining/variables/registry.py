@@ -1,3 +1,7 @@
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Optional
+
 from spatial_data_mining.extract.alpha_earth import AlphaEarthExtractor
 from spatial_data_mining.extract.clcplus import CLCPlusExtractor
 from spatial_data_mining.extract.gee import GEEExtractor
@@ -6,34 +10,54 @@ from spatial_data_mining.transform.raster_ops import (
     process_raster_to_target,
 )
 
-VARIABLES = {
-    "ndvi": {"extractor_factory": lambda _job=None: GEEExtractor("NDVI"), "transform": process_raster_to_target},
-    "ndmi": {"extractor_factory": lambda _job=None: GEEExtractor("NDMI"), "transform": process_raster_to_target},
-    "msi": {"extractor_factory": lambda _job=None: GEEExtractor("MSI"), "transform": process_raster_to_target},
-    "bsi": {"extractor_factory": lambda _job=None: GEEExtractor("BSI"), "transform": process_raster_to_target},
-    "alpha_earth": {
-        "extractor_factory": lambda _job=None: AlphaEarthExtractor(),
-        "transform": process_raster_to_target,
-    },
-    "clcplus": {
-        "extractor_factory": lambda job=None: CLCPlusExtractor(
-            getattr(job, "clcplus_input_dir", None)
+
+@dataclass(frozen=True, slots=True)
+class VariableSpec:
+    """One registry entry: how to build the extractor and which transform to run."""
+
+    name: str
+    extractor_cls: type
+    extractor_kwargs: Callable[[Any], Dict[str, Any]]
+    transform: Callable
+
+
+def _no_kwargs(_job=None) -> Dict[str, Any]:
+    return {}
+
+
+def _gee_kwargs(index: str) -> Callable[[Any], Dict[str, Any]]:
+    return lambda _job=None: {"index": index}
+
+
+def _clcplus_kwargs(job=None) -> Dict[str, Any]:
+    return {"input_dir": getattr(job, "clcplus_input_dir", None)}
+
+
+VARIABLES: "MappingProxyType[str, VariableSpec]" = MappingProxyType(
+    {
+        "ndvi": VariableSpec("ndvi", GEEExtractor, _gee_kwargs("NDVI"), process_raster_to_target),
+        "ndmi": VariableSpec("ndmi", GEEExtractor, _gee_kwargs("NDMI"), process_raster_to_target),
+        "msi": VariableSpec("msi", GEEExtractor, _gee_kwargs("MSI"), process_raster_to_target),
+        "bsi": VariableSpec("bsi", GEEExtractor, _gee_kwargs("BSI"), process_raster_to_target),
+        "alpha_earth": VariableSpec(
+            "alpha_earth", AlphaEarthExtractor, _no_kwargs, process_raster_to_target
+        ),
+        "clcplus": VariableSpec(
+            "clcplus", CLCPlusExtractor, _clcplus_kwargs, process_clcplus_to_target
         ),
-        "transform": process_clcplus_to_target,
-    },
-}
+    }
+)
 
 
-def _resolve_extractor(var_def: dict, job_cfg=None):
-    if "extractor_factory" in var_def:
-        return var_def["extractor_factory"](job_cfg)
-    return var_def.get("extractor")
+def get_variable_spec(name: str) -> Optional[VariableSpec]:
+    return VARIABLES.get(name.lower())
 
 
 def get_variable(name: str, job_cfg=None):
-    key = name.lower()
-    if key not in VARIABLES:
+    spec = VARIABLES.get(name.lower())
+    if spec is None:
         raise KeyError(f"Variable not registered: {name}")
-    var_def = VARIABLES[key]
-    extractor = _resolve_extractor(var_def, job_cfg=job_cfg)
-    return {"extractor": extractor, "transform": var_def["transform"]}
+    return {
+        "extractor": spec.extractor_cls(**spec.extractor_kwargs(job_cfg)),
+        "transform": spec.transform,
+    }